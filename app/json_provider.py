@@ -0,0 +1,39 @@
+"""
+orjson JSON Provider
+
+This script defines a Flask JSON provider backed by orjson, so request parsing
+(`request.json`) and `jsonify` responses skip the pure-Python stdlib json path.
+
+Classes:
+    - OrjsonProvider: Flask JSON provider using orjson for dumps/loads.
+
+Usage:
+    Assign an instance to `app.json` when creating the Flask application.
+"""
+
+from typing import Any
+
+import orjson
+from flask import Response
+from flask.json.provider import JSONProvider
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider that serializes and parses JSON with orjson.
+
+    Methods:
+        dumps: Serialize an object to a JSON string.
+        loads: Deserialize a JSON string or bytes.
+        response: Build a JSON response without an intermediate str.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj: Any = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
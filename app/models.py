@@ -6,8 +6,13 @@ User and PublicMessage models. It includes relationships, schema definitions, an
 basic methods for user authentication.
 
 Imports:
-    - bcrypt: For password hashing and checking
+    - argon2: For Argon2id password hashing and checking
     - sqlalchemy components: Column, Integer, String, ForeignKey, declarative_base, relationship
+    - cryptography: AES-GCM encryption of stored message content
+
+Functions:
+    - message_cipher: Returns the cached AES-GCM cipher keyed from ENCRYPTION_KEY.
+    - verify_password: Checks a password against a stored Argon2 hash.
 
 Classes:
     - User: Represents a user with a username and password hash.
@@ -18,23 +23,65 @@ Usage:
 """
 
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 
-import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
 
 from utils.constants import SECRET
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, LargeBinary
 from sqlalchemy.sql import func
-from sqlalchemy.orm import declarative_base, relationship
-from cryptography.fernet import Fernet
+from sqlalchemy.orm import declarative_base, reconstructor, relationship
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 
 import os
 
-key = os.environ.get('ENCRYPTION_KEY', Fernet.generate_key().decode())
-f = Fernet(key.encode())
+NONCE_SIZE: int = 12
+
 Base = declarative_base()
 
+# Argon2id parameters follow the OWASP password storage recommendation
+# (m=46 MiB, t=3, p=1), shared by registration and login.
+ph = PasswordHasher(time_cost=3, memory_cost=46 * 1024, parallelism=1, hash_len=32)
+
+
+@lru_cache(maxsize=None)
+def message_cipher() -> AESGCM:
+    """
+    Build the AES-GCM cipher for message content from the ENCRYPTION_KEY environment variable.
+
+    The key is decoded once and the cipher reused for every message. There is no
+    generated fallback: a per-process random key would make stored messages
+    unreadable after a restart.
+
+    Returns:
+        AESGCM: The cipher keyed with the decoded ENCRYPTION_KEY.
+
+    Raises:
+        KeyError: If ENCRYPTION_KEY is not set.
+    """
+    return AESGCM(base64.urlsafe_b64decode(os.environ["ENCRYPTION_KEY"]))
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Check a password against an encoded Argon2 hash.
+
+    Args:
+        password_hash (str): The encoded hash stored for the user.
+        password (str): The password to check.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+    """
+    try:
+        return ph.verify(password_hash, password)
+    except VerifyMismatchError:
+        return False
+
 
 class User(Base):
     """
@@ -51,11 +98,20 @@ class User(Base):
         check_password: Checks if the provided password matches the stored password hash.
     """
     __tablename__ = "users"
-    __table_args__ = {"schema": "chat"}
+    __table_args__ = (
+        # Covers the login lookup (id, password_hash by username) with an index-only scan.
+        Index(
+            "ix_users_username_covering",
+            "username",
+            unique=True,
+            postgresql_include=["id", "password_hash"],
+        ),
+        {"schema": "chat"},
+    )
 
     id: int = Column(Integer, primary_key=True)
-    username: str = Column(String(50), unique=True, nullable=False)
-    password_hash: str = Column(String(128), nullable=False)
+    username: str = Column(String(50), nullable=False)
+    password_hash: str = Column(String(256), nullable=False)
 
     messages = relationship("PublicMessage", back_populates="author")
 
@@ -72,7 +128,7 @@ class User(Base):
         Returns:
             bool: True if the password matches, False otherwise.
         """
-        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash.encode("utf-8"))
+        return verify_password(self.password_hash, password)
 
 
 class PublicMessage(Base):
@@ -88,26 +144,41 @@ class PublicMessage(Base):
 
     Methods:
         __repr__: Returns a string representation of the message.
+
+    The decrypted message is cached on the instance after the first access and
+    kept in sync by the setter, so repeated reads decrypt only once.
     """
     __tablename__ = "messages"
     __table_args__ = {"schema": "chat"}
 
     id: int = Column(Integer, primary_key=True)
     author_id: int = Column(Integer, ForeignKey("chat.users.id"))
-    _message: str = Column("message", String(1024), nullable=False)
+    # Stored as nonce || ciphertext || tag.
+    _message: bytes = Column("message", LargeBinary(1100), nullable=False)
     timestamp: datetime = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     author = relationship("User", back_populates="messages")
 
+    def __init__(self, **kwargs) -> None:
+        self._plaintext: Optional[str] = None
+        super().__init__(**kwargs)
+
+    @reconstructor
+    def _init_on_load(self) -> None:
+        self._plaintext = None
+
     @property
     def message(self):
-        decrypted_message: str = f.decrypt(self._message.encode()).decode()
-        return decrypted_message
+        if self._plaintext is None:
+            nonce, ciphertext = self._message[:NONCE_SIZE], self._message[NONCE_SIZE:]
+            self._plaintext = message_cipher().decrypt(nonce, ciphertext, None).decode()
+        return self._plaintext
     
     @message.setter
     def message(self, value: str):
-        encrypted_message: str = f.encrypt(value.encode()).decode()
-        self._message = encrypted_message
+        nonce: bytes = os.urandom(NONCE_SIZE)
+        self._message = nonce + message_cipher().encrypt(nonce, value.encode(), None)
+        self._plaintext = value
 
     def __repr__(self) -> str:
         return f"Author Id: {self.author_id} - Message: {self.message} - Timestamp: {self.timestamp}"
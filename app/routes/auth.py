@@ -2,17 +2,18 @@
 Flask Route Handlers for User Authentication
 
 This script defines the Flask route handlers for user registration and login,
-utilizing bcrypt for password hashing and JWT for token generation.
+utilizing Argon2id for password hashing and JWT for token generation.
 
 Imports:
-    - bcrypt: For password hashing and checking
+    - base64: For encoding the JWT signing key as a JWK
     - jwt: For JSON Web Token encoding
     - datetime, timezone, timedelta: For handling date and time
     - flask components: request, jsonify, Response
-    - app.models: User model
+    - sqlalchemy: Core insert/select for the registration and login statements
+    - app.models: User model, the shared Argon2id password hasher and verify_password
     - typing: Dict, Tuple, Optional for type hinting
     - utils.constants: SECRET key for JWT
-    - app: Flask application and SQLAlchemy session
+    - app: Flask application, SQLAlchemy engine and session
 
 Routes:
     - /register: Handles user registration
@@ -22,13 +23,36 @@ Usage:
     Add these routes to the Flask application to enable user authentication.
 """
 
+import base64
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Tuple, Optional
-import bcrypt
 import jwt
 from flask import request, jsonify, Response
-from app.models import User
-from app import app, Session
+from sqlalchemy import bindparam, exists, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from app.models import User, ph, verify_password
+from app import app, engine, Session
+
+# Built once so SQLAlchemy's compiled-statement cache is hit on every request.
+_LOGIN_STMT = select(User.id, User.password_hash).where(User.username == bindparam("u"))
+_REGISTER_STMT = insert(User).returning(User.id)
+_USERNAME_TAKEN_STMT = select(literal(1)).where(exists().where(User.username == bindparam("u")))
+
+# Verified against when the username does not exist, so unknown and known usernames
+# cost the same Argon2 work and cannot be told apart by response time.
+_DUMMY_HASH: str = ph.hash("not-a-real-password")
+
+# Upper bound on password length so a single request cannot make Argon2 hash megabytes.
+MAX_PASSWORD_LENGTH: int = 1024
+
+# Signing key prepared once instead of on every jwt.encode call.
+_JWT_KEY = jwt.PyJWK.from_dict(
+    {
+        "kty": "oct",
+        "k": base64.urlsafe_b64encode(app.config["SECRET_KEY"].encode()).rstrip(b"=").decode(),
+        "alg": "HS256",
+    }
+)
 
 
 @app.route("/register", methods=["POST"])
@@ -38,7 +62,8 @@ def register() -> Tuple[Response, int]:
 
     This route handles the registration of a new user by accepting a JSON
     payload with a username and password, hashing the password, and storing
-    the user in the database.
+    the user in the database. Oversized passwords and taken usernames are
+    rejected before the password is hashed.
 
     Returns:
         Tuple[Response, int]: JSON response indicating success or failure and the HTTP status code.
@@ -52,22 +77,26 @@ def register() -> Tuple[Response, int]:
         password = ""
 
     if not username or not password:
-        return jsonify({"error: Username and password are both required"}), 400
+        return jsonify({"error": "Username and password are both required"}), 400
 
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-    hashed_password_str: str = hashed_password.decode("utf-8")
-    print(f"Registering user: {username} with hash: {hashed_password_str}")
+    if len(password) > MAX_PASSWORD_LENGTH:
+        return jsonify({"error": "Password is too long"}), 400
 
-    session = Session()
-    user = User(username=username, password_hash=hashed_password_str)
-    session.add(user)
-    session.commit()
-    session.close()
+    with engine.connect() as conn:
+        if conn.execute(_USERNAME_TAKEN_STMT, {"u": username}).scalar():
+            return jsonify({"error": "Username already taken"}), 409
 
-    user2 = session.query(User).filter_by(username=username).first()
-    print(f"User found: {user2.username} with stored hash: {user2.password_hash}")
+    hashed_password_str: str = ph.hash(password)
 
-    return jsonify({"message": "User registered successfully"}), 201
+    try:
+        with engine.begin() as conn:
+            user_id: int = conn.execute(
+                _REGISTER_STMT, {"username": username, "password_hash": hashed_password_str}
+            ).scalar_one()
+    except IntegrityError:
+        return jsonify({"error": "Username already taken"}), 409
+
+    return jsonify({"message": "User registered successfully", "user_id": user_id}), 201
 
 
 @app.route("/login", methods=["POST"])
@@ -91,20 +120,24 @@ def login() -> Tuple[Response, int]:
         password = ""
 
     if not username or not password:
-        return jsonify({"error: Username and password are both required"}), 400
+        return jsonify({"error": "Username and password are both required"}), 400
 
     session = Session()
-    user: Optional[User] = session.query(User).filter_by(username=username).first()
+    row = session.execute(_LOGIN_STMT, {"u": username}).first()
     session.close()
 
-    if user and user.check_password(password):
+    if row is None:
+        verify_password(_DUMMY_HASH, password)
+        return jsonify({"error": "Invalid username or password"}), 400
+
+    if verify_password(row.password_hash, password):
         token: str = jwt.encode(
             {
-                "user_id": user.id,
+                "user_id": row.id,
                 "username": username,
-                "exp": datetime.now(tz=timezone.utc) + timedelta(minutes=10),
+                "exp": int((datetime.now(tz=timezone.utc) + timedelta(minutes=10)).timestamp()),
             },
-            app.config["SECRET_KEY"],
+            _JWT_KEY.key,
             algorithm="HS256",
         )
         return jsonify({"message": "Login successful", "token": token}), 200
@@ -5,9 +5,11 @@ This script defines a simple chat client implementation using the ChatClient cla
 The client connects to a chat server and facilitates communication with other clients.
 """
 
+import os
 import socket
 import threading
 import requests
+from requests.adapters import HTTPAdapter
 from utils.constants import URL
 from .client_handler import ClientHandler
 
@@ -41,6 +43,12 @@ class ChatClient:
         self.host: str = host
         self.port: int = port
         self.auth_url: str = URL
+        # One keep-alive session so register -> login reuses the same connection.
+        self._http: requests.Session = requests.Session()
+        adapter: HTTPAdapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._http.headers.update({"Content-Type": "application/json"})
         self.client_socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.username: str = ""
         self.password: str = ""
@@ -59,7 +67,7 @@ class ChatClient:
         Raises:
             Exception: If the authentication request fails (e.g., invalid credentials).
         """
-        response = requests.post(
+        response = self._http.post(
             self.auth_url + "/login", json={"username": self.username, "password": self.password}
         )
         if response.status_code == 200:
@@ -79,7 +87,7 @@ class ChatClient:
         Raises:
             Exception: If the user creation request fails (e.g., username already taken).
         """
-        response = requests.post(
+        response = self._http.post(
             self.auth_url + "/register", json={"username": self.username, "password": self.password}
         )
         if response.status_code == 201:
@@ -91,8 +99,9 @@ class ChatClient:
         """
         Start the chat client.
 
-        Connects to the chat server and initiates message sending/receiving by starting
-        separate threads for sending and receiving messages.
+        Connects to the chat server and initiates message sending/receiving. On Windows,
+        where stdin cannot be selected on, separate threads are started for sending and
+        receiving messages; elsewhere a single selector loop handles both.
         """
         self.username = username
         self.password = password
@@ -102,6 +111,9 @@ class ChatClient:
         else:
             self.authenticate()
 
-        self.client_socket.send(self.token.encode("utf-8"))
-        threading.Thread(target=self.client_handler.receive_messages).start()
-        self.client_handler.send_messages()
+        self.client_handler.send_message(self.token)
+        if os.name == "nt":  # For Windows
+            threading.Thread(target=self.client_handler.receive_messages).start()
+            self.client_handler.send_messages()
+        else:  # For Unix/Linux/MacOS
+            self.client_handler.run()
@@ -5,9 +5,13 @@ This script defines a client handler class, ClientHandler, for handling communic
 with a chat server from the client side.
 """
 
+import selectors
 import socket
 import sys
 import os
+from typing import List, Optional
+
+from utils.framing import FrameReader, encode_frame
 
 if os.name == "nt":  # For Windows
     import msvcrt
@@ -24,7 +28,12 @@ class ClientHandler:
         current_input (str): The current input message from the client.
         username (str): The username or identifier for the client.
 
+    Messages are length-prefixed frames (see utils.framing). Incoming data is read
+    with `recv_into` into one preallocated buffer that is reused for every message.
+
     Methods:
+        run(): Multiplex incoming messages and keyboard input on a single thread.
+        send_message(message: str): Send one framed message to the chat server.
         receive_messages(): Continuously receive messages from the chat server
                             and display them to the client.
         send_messages(): Continuously prompt the client for messages and
@@ -42,6 +51,103 @@ class ClientHandler:
         self.client_socket: socket.socket = client_socket
         self.current_input: str = ""
         self.username: str = username
+        self._running: bool = False
+        self._reader: FrameReader = FrameReader()
+
+    def run(self) -> None:
+        """
+        Receive and send messages from a single thread using a selector.
+
+        The socket and stdin are both registered for read readiness, so no thread
+        sits blocked in `input()` while another blocks in `recv()`. Only usable
+        where stdin is selectable, which excludes Windows.
+        """
+        selector = selectors.DefaultSelector()
+        selector.register(self.client_socket, selectors.EVENT_READ, self._on_net)
+        selector.register(sys.stdin, selectors.EVENT_READ, self._on_stdin)
+        self._running = True
+        self._prompt()
+        try:
+            while self._running:
+                for key, _ in selector.select():
+                    key.data()
+                    if not self._running:
+                        break
+        finally:
+            selector.close()
+
+    def _prompt(self) -> None:
+        """
+        Write the input prompt without a trailing newline.
+        """
+        sys.stdout.write("You: ")
+        sys.stdout.flush()
+
+    def send_message(self, message: str) -> None:
+        """
+        Send one length-prefixed message to the chat server.
+
+        Args:
+            message (str): The message to send.
+        """
+        self.client_socket.sendall(encode_frame(message.encode("utf-8")))
+
+    def _recv_messages(self) -> Optional[List[str]]:
+        """
+        Read from the server into the reusable receive buffer and decode complete messages.
+
+        Returns:
+            Optional[List[str]]: The messages completed by this read (possibly none), or
+                                 None if the server closed the connection.
+        """
+        if not self._reader.recv_from(self.client_socket):
+            return None
+        return [str(frame, "utf-8") for frame in self._reader.frames()]
+
+    def _show(self, messages: List[str]) -> None:
+        """
+        Print messages above the input prompt.
+
+        Args:
+            messages (List[str]): The messages to display.
+        """
+        for message in messages:
+            sys.stdout.write("\r" + " " * 80 + "\r")
+            print(message)
+            self._prompt()
+
+    def _on_net(self) -> None:
+        """
+        Display the messages that arrived from the chat server.
+        """
+        try:
+            messages: Optional[List[str]] = self._recv_messages()
+        except OSError as e:
+            print(f"Connection to server lost: {e}")
+            messages = None
+        if messages is None:
+            self.end_connection()
+            return
+
+        self._show(messages)
+
+    def _on_stdin(self) -> None:
+        """
+        Send the line typed by the client to the chat server.
+        """
+        line: str = sys.stdin.readline()
+        self.current_input = line.rstrip("\n") if line else "!exit"
+        sys.stdout.write("\033[F")  # Move cursor up one line
+        sys.stdout.write("\033[K")  # Clear current line
+        sys.stdout.flush()
+        try:
+            self.send_message(self.current_input)
+        except OSError as e:
+            print(f"Error sending message: {e}")
+            self.end_connection()
+            return
+        if self.current_input == "!exit":
+            self.end_connection()
 
     def receive_messages(self) -> None:
         """
@@ -49,14 +155,11 @@ class ClientHandler:
         """
         while True:
             try:
-                message: str = self.client_socket.recv(1024).decode("utf-8")
-                if not message:
+                messages: Optional[List[str]] = self._recv_messages()
+                if messages is None:
                     break
 
-                sys.stdout.write("\r" + " " * 80 + "\r")
-                print(message)
-                sys.stdout.write("You: ")
-                sys.stdout.flush()
+                self._show(messages)
             except Exception as e:
                 print(f"Connection to server lost: {e}")
                 self.client_socket.close()
@@ -74,7 +177,7 @@ class ClientHandler:
                 sys.stdout.write("\033[F")  # Move cursor up one line
                 sys.stdout.write("\033[K")  # Clear current line
             try:
-                self.client_socket.send(self.current_input.encode("utf-8"))
+                self.send_message(self.current_input)
                 if self.current_input == "!exit":
                     self.end_connection()
                     break
@@ -87,4 +190,5 @@ class ClientHandler:
         """
         Close connection to server.
         """
+        self._running = False
         self.client_socket.close()
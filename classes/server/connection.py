@@ -0,0 +1,43 @@
+"""
+Chat Server Connection Script
+
+This script defines the ClientConnection class, which holds the per-connection state
+the ChatServer event loop needs between readiness events.
+"""
+
+import socket
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from utils.framing import FrameReader
+
+
+class ClientConnection:
+    """
+    State of a single client connection handled by the ChatServer event loop.
+
+    Attributes:
+        sock (socket.socket): The non-blocking socket of the client.
+        addr (Tuple[str, int]): The address (IP, port) of the client.
+        fd (int): File descriptor of the socket, captured at accept time.
+        username (Optional[str]): Username from the client's token, None until authenticated.
+        user_id (Optional[int]): User id from the client's token.
+        reader (FrameReader): Receive buffer and length-prefixed message decoder.
+        out_queue (Deque[bytes]): Framed messages queued for the client and not yet sent.
+    """
+
+    def __init__(self, sock: socket.socket, addr: Tuple[str, int]) -> None:
+        """
+        Initialize the ClientConnection instance.
+
+        Args:
+            sock (socket.socket): The accepted client socket.
+            addr (Tuple[str, int]): The address (IP, port) of the client.
+        """
+        self.sock: socket.socket = sock
+        self.addr: Tuple[str, int] = addr
+        self.fd: int = sock.fileno()
+        self.username: Optional[str] = None
+        self.user_id: Optional[int] = None
+        self.reader: FrameReader = FrameReader()
+        self.out_queue: Deque[bytes] = deque()
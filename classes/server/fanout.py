@@ -0,0 +1,113 @@
+"""
+Chat Server Fanout Script
+
+This script defines the PeerFanout class, which relays broadcast messages between
+ChatServer processes that share one listening port through SO_REUSEPORT. The kernel
+spreads incoming connections across the processes, so a message sent by a client of
+one process must be forwarded to the others to reach every client.
+
+Each process binds a non-blocking UNIX datagram socket at a well-known path and sends
+every broadcast frame, once, to the sockets of its peers.
+
+Imports:
+    - logging: For reporting messages that could not be relayed
+    - os, socket, tempfile: For the datagram sockets and their paths
+    - typing: List for type hinting
+    - utils.framing: RECV_BUFFER_SIZE to bound the size of a relayed message
+"""
+
+import logging
+import os
+import socket
+import tempfile
+from typing import List
+
+from utils.framing import RECV_BUFFER_SIZE
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def fanout_path(port: int, index: int) -> str:
+    """
+    Return the path of the datagram socket of one server process.
+
+    Args:
+        port (int): The TCP port shared by the server processes.
+        index (int): The index of the server process.
+
+    Returns:
+        str: The filesystem path of the process's datagram socket.
+    """
+    return os.path.join(tempfile.gettempdir(), f"chat-server-{port}-{index}.sock")
+
+
+class PeerFanout:
+    """
+    Datagram relay of broadcast frames between the server processes sharing a port.
+
+    Attributes:
+        sock (socket.socket): The non-blocking datagram socket of this process.
+        path (str): The path the socket is bound to.
+
+    Methods:
+        publish(frame: bytes): Send a framed message to every peer process.
+        receive(): Return every framed message relayed by the peers so far.
+        close(): Close the socket and remove its path.
+    """
+
+    def __init__(self, index: int, processes: int, port: int) -> None:
+        """
+        Initialize the PeerFanout instance and bind its datagram socket.
+
+        Args:
+            index (int): The index of this process, from 0 to processes - 1.
+            processes (int): The number of server processes sharing the port.
+            port (int): The TCP port shared by the server processes.
+        """
+        self.path: str = fanout_path(port, index)
+        self._peers: List[str] = [
+            fanout_path(port, peer) for peer in range(processes) if peer != index
+        ]
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.sock: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.path)
+        self.sock.setblocking(False)
+
+    def publish(self, frame: bytes) -> None:
+        """
+        Send a framed message to every peer process.
+
+        A peer that is not up yet or whose queue is full misses the message; the
+        sending process is never blocked by a slow peer.
+
+        Args:
+            frame (bytes): The length-prefixed message to relay.
+        """
+        for peer in self._peers:
+            try:
+                self.sock.sendto(frame, peer)
+            except (BlockingIOError, FileNotFoundError, ConnectionRefusedError) as e:
+                logger.warning("Error relaying message to %s: %s", peer, e)
+
+    def receive(self) -> List[bytes]:
+        """
+        Read every framed message the peers have relayed so far.
+
+        Returns:
+            List[bytes]: The relayed length-prefixed messages, in arrival order.
+        """
+        frames: List[bytes] = []
+        while True:
+            try:
+                frames.append(self.sock.recv(RECV_BUFFER_SIZE))
+            except BlockingIOError:
+                return frames
+
+    def close(self) -> None:
+        """
+        Close the datagram socket and remove its path.
+        """
+        self.sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
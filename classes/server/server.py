@@ -3,20 +3,95 @@ Chat Server Script
 
 This script defines a simple chat server implementation using the ChatServer class.
 The server listens for incoming connections from clients and facilitates communication
-between them.
+between them. All sockets are non-blocking and multiplexed by a single selector
+(epoll on Linux) event loop; database writes are handed off to a small worker pool.
 """
 
+import logging
+import math
+import os
+import selectors
 import socket
 import threading
-from typing import Tuple, Dict, List, Optional
-from datetime import datetime   
+import time
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Tuple, Dict, List, Optional, Set, Union
 import jwt
 from app.models import PublicMessage, User
 from app import app, Session
 
 from utils.constants import SECRET
+from utils.framing import encode_frame
+from .connection import ClientConnection
+from .fanout import PeerFanout
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 TIMESTAMP_FORMAT: str = "%d/%m/%Y %H:%M:%S"
+DEFAULT_MAX_WORKERS: int = min(32, (os.cpu_count() or 1) * 4)
+SOCKET_BUFFER_SIZE: int = 4 * 1024 * 1024
+LISTEN_BACKLOG: int = 1024
+TOKEN_CACHE_SIZE: int = 4096
+# A client with more than this many bytes still queued after a flush is not keeping up
+# and is disconnected instead of letting its queue grow without bound.
+OUTBOUND_HIGH_WATER: int = 8 * 1024 * 1024
+# Maximum number of buffers a single sendmsg call accepts on Linux.
+IOV_MAX: int = 1024
+_HAS_SENDMSG: bool = hasattr(socket.socket, "sendmsg")
+
+# A framed message, or the unsent tail of one, waiting in a client's outbound queue.
+Chunk = Union[bytes, memoryview]
+
+# [second, formatted timestamp] of the last call to current_timestamp().
+_timestamp_cache: List = [-1, ""]
+
+
+def current_timestamp() -> str:
+    """
+    Return the current local time formatted with TIMESTAMP_FORMAT.
+
+    Messages within the same second share a timestamp, so the formatted string is
+    cached and strftime only runs once per second.
+
+    Returns:
+        str: The formatted current time.
+    """
+    now: int = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache[:] = [now, time.strftime(TIMESTAMP_FORMAT, time.localtime(now))]
+    return _timestamp_cache[1]
+
+
+def send_queued(client_socket: socket.socket, queue: Deque[Chunk]) -> None:
+    """
+    Send as much of an outbound queue as the socket accepts, without joining its chunks.
+
+    The chunks are handed to the kernel as one iovec array; fully sent chunks are removed
+    and a partially sent one is replaced by a view of its unsent tail.
+
+    Args:
+        client_socket (socket.socket): The non-blocking client socket.
+        queue (Deque[Chunk]): The framed messages waiting to be sent.
+
+    Raises:
+        OSError: If sending fails for any reason other than a full send buffer.
+    """
+    try:
+        if _HAS_SENDMSG:
+            sent: int = client_socket.sendmsg(list(islice(queue, IOV_MAX)))
+        else:
+            sent = client_socket.send(b"".join(queue))
+    except BlockingIOError:
+        return
+    while sent:
+        head: Chunk = queue[0]
+        if len(head) > sent:
+            queue[0] = memoryview(head)[sent:]
+            return
+        sent -= len(head)
+        queue.popleft()
 
 
 class ChatServer:
@@ -30,18 +105,47 @@ class ChatServer:
         host (str): The IP address or hostname of the server. Default is '127.0.0.1'.
         port (int): The port number on which the server listens for connections.
                     Default is 9999.
+        clients (Dict[int, Tuple[str, int]]): Username and user id of each connected
+                                              client, keyed by socket file descriptor.
+        ready (threading.Event): Set once the event loop is running.
+
+    The broadcast path reads parallel lists of file descriptors, sockets and usernames
+    (one index per client) instead of a dict of tuples; `_idx_by_fd` maps a file
+    descriptor to its index so a client is removed in O(1) by swapping with the last.
+
+    Broadcasts are not sent right away: each frame is encoded once and a reference to it
+    is appended to the recipients' outbound queues. Every queue is flushed with one
+    scatter-gather `sendmsg` at the end of the event loop tick, so a burst of messages
+    costs one syscall per client and no per-client copy of the message.
 
     Methods:
-        start(): Start the chat server and listen for incoming connections.
-        handle_client(client_socket: socket.socket, addr: Tuple[str, int]):
-            Handle communication with a connected client.
+        start(): Run the event loop, accepting connections and dispatching client messages.
+        accept_clients(): Accept every pending connection on the listening socket.
+        authenticate_client(connection: ClientConnection, token: str):
+            Verify the token a new connection sends first.
+        handle_client(connection: ClientConnection):
+            Read and dispatch the messages that arrived from a client.
+        handle_message(connection: ClientConnection, frame: memoryview):
+            Handle one message: the token, a command or a chat message.
+        close_client(client_socket: socket.socket):
+            Stop watching a client socket, remove it and close it.
+        flush(): Send every pending outbound buffer.
+        shutdown(): Shut down the worker pool.
         remove_client(client_socket: socket.socket):
             Remove a client from the list of active clients.
-        broadcast(message: str, current_client: socket.socket):
-            Broadcast a message to all connected clients except the sender.
+        broadcast(message: Union[str, bytes], exclude: Optional[socket.socket]):
+            Broadcast a message to all connected clients, optionally except one.
     """
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 9999) -> None:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9999,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        reuse_port: bool = False,
+        fanout: Optional[PeerFanout] = None,
+        cpu: Optional[int] = None,
+    ) -> None:
         """
         Initialize the ChatServer instance.
 
@@ -49,78 +153,239 @@ class ChatServer:
             host (str): The IP address or hostname of the server. Default is '127.0.0.1'.
             port (int): The port number on which the server listens for connections.
                         Default is 9999.
+            max_workers (int): Size of the worker pool that stores messages in the database.
+            reuse_port (bool): Set SO_REUSEPORT so several server processes can listen on
+                               the same port, with the kernel spreading connections.
+            fanout (Optional[PeerFanout]): Relay to the other processes sharing the port,
+                                           so broadcasts reach their clients too.
+            cpu (Optional[int]): CPU to pin the event loop thread to; the database workers
+                                 then run on the remaining CPUs. Linux only.
         """
 
         self.host: str = host
         self.port: int = port
         self.secret_key: str = SECRET
+        # Decoder and algorithm list built once and reused for every handshake.
+        self._jwt_decoder: jwt.PyJWT = jwt.PyJWT(options={"verify_signature": True})
+        self._algorithms: Tuple[str, ...] = ("HS256",)
+        # token -> (username, user_id, exp) of recently verified tokens, least recent first.
+        self._token_cache: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
         self.server_socket: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Set before bind/listen so accepted sockets inherit the larger buffers. The kernel
+        # clamps the values to net.core.rmem_max / wmem_max.
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        if reuse_port:
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(5)
-        self.clients: Dict[socket.socket, Tuple[str, int]] = {}
-        self.session = Session()
-
-        print(f"Server listening on {self.host}:{self.port}")
+        self.server_socket.listen(LISTEN_BACKLOG)
+        self.server_socket.setblocking(False)
+        self.clients: Dict[int, Tuple[str, int]] = {}
+        # Parallel per-client lists walked by broadcast; index i describes one client.
+        self._clients_lock: threading.Lock = threading.Lock()
+        self._fds: List[int] = []
+        self._socks: List[socket.socket] = []
+        self._names: List[str] = []
+        self._queues: List[Deque[Chunk]] = []
+        # File descriptors whose outbound buffer gained data since the last flush.
+        self._pending: Set[int] = set()
+        self._idx_by_fd: Dict[int, int] = {}
+        # Bumped on every join and leave; the framed !who reply is cached per version.
+        self._who_version: int = 0
+        self._who_cache: Tuple[int, bytes] = (-1, b"")
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._selector.register(self.server_socket, selectors.EVENT_READ)
+        self._fanout: Optional[PeerFanout] = fanout
+        if fanout is not None:
+            self._selector.register(fanout.sock, selectors.EVENT_READ)
+        self.cpu: Optional[int] = cpu if hasattr(os, "sched_setaffinity") else None
+        # Workers are spawned from the pinned event loop thread and would inherit its CPU.
+        self._worker_cpus: Set[int] = set()
+        if self.cpu is not None:
+            self._worker_cpus = os.sched_getaffinity(0) - {self.cpu}
+        self._pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="chat-worker",
+            initializer=self._place_worker,
+        )
+
+        self.ready: threading.Event = threading.Event()
+
+        logger.info("Server listening on %s:%s", self.host, self.port)
 
     def start(self) -> None:
         """
-        Start the chat server and listen for incoming connections.
+        Start the chat server and run its event loop.
+
+        The listening socket and every client socket are registered with one selector;
+        each readiness event is dispatched to accept new clients or handle a client.
+        Outbound buffers are flushed once the whole batch of events is handled.
+        """
+        if self.cpu is not None:
+            # Keeps the loop's sockets, buffers and client lists warm in one core's cache.
+            os.sched_setaffinity(0, {self.cpu})
+        self.ready.set()
+        while True:
+            for key, mask in self._selector.select():
+                connection: Optional[ClientConnection] = key.data
+                if connection is None:
+                    if key.fileobj is self.server_socket:
+                        self.accept_clients()
+                    else:
+                        self._relay_from_peers()
+                    continue
+                if connection.sock.fileno() == -1:
+                    # Closed by an earlier callback in this same batch of events.
+                    continue
+                if mask & selectors.EVENT_WRITE:
+                    self._pending.add(connection.fd)
+                if not mask & selectors.EVENT_READ:
+                    continue
+                try:
+                    self.handle_client(connection)
+                except Exception as e:
+                    logger.warning("Error handling client %s: %s", connection.addr, e)
+                    self.close_client(connection.sock)
+            self.flush()
+
+    def accept_clients(self) -> None:
+        """
+        Accept every pending connection and register it for reading.
         """
         while True:
             try:
                 client_socket: socket.socket
                 addr: Tuple[str, int]
                 client_socket, addr = self.server_socket.accept()
-                token: str = client_socket.recv(1024).decode("utf-8")
-                client_username, client_id = self.verify_token(token)
-                if client_username:
-                    self.clients[client_socket] = (client_username, client_id)
-                    self.broadcast(f"{client_username} entered the chat!")
-                    threading.Thread(target=self.handle_client, args=(client_socket, addr)).start()
-                else:
-                    client_socket.close()
-            except Exception as e:
-                print(f"Error accepting connection: {e}")
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logger.warning("Error accepting connection: %s", e)
+                return
+
+            client_socket.setblocking(False)
+            # Chat messages are small; send them immediately instead of waiting on Nagle.
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._selector.register(
+                client_socket, selectors.EVENT_READ, ClientConnection(client_socket, addr)
+            )
 
-    def handle_client(self, client_socket: socket.socket, addr: Tuple[str, int]) -> None:
+    def authenticate_client(self, connection: ClientConnection, token: str) -> bool:
         """
-        Handle communication with a connected client.
+        Verify the token a new connection sends as its first message and admit it to the chat.
 
         Args:
-            client_socket (socket.socket): The socket object representing the client connection.
-            addr (Tuple[str, int]): The address (IP, port) of the connected client.
+            connection (ClientConnection): The connection that has not authenticated yet.
+            token (str): The JWT token sent by the client.
+
+        Returns:
+            bool: True if the client was admitted, False if the connection was closed.
+        """
+        client_username, client_id = self.verify_token(token)
+        if not client_username:
+            self.close_client(connection.sock)
+            return False
+
+        connection.username = client_username
+        connection.user_id = client_id
+        with self._clients_lock:
+            self.clients[connection.fd] = (client_username, client_id)
+            self._idx_by_fd[connection.fd] = len(self._fds)
+            self._fds.append(connection.fd)
+            self._socks.append(connection.sock)
+            self._names.append(client_username)
+            self._queues.append(connection.out_queue)
+            self._who_version += 1
+        logger.info("New connection from %s", connection.addr)
+        self.broadcast(f"{client_username} entered the chat!")
+        return True
+
+    def shutdown(self) -> None:
         """
-        print(f"New connection from {addr}")
+        Shut down the worker pool without waiting for pending database writes.
+        """
+        self._pool.shutdown(wait=False)
+        if self._fanout is not None:
+            self._fanout.close()
+
+    def handle_client(self, connection: ClientConnection) -> None:
+        """
+        Handle every message currently readable from a client.
+
+        Reads until the socket would block, so one readiness event drains everything
+        the client has sent so far; each read may carry several length-prefixed messages.
+
+        Args:
+            connection (ClientConnection): The connection of the client.
+        """
+        client_socket: socket.socket = connection.sock
+        # Bound once per event rather than looked up for every read and message.
+        recv_from = connection.reader.recv_from
+        frames = connection.reader.frames
+        handle_message = self.handle_message
         while True:
             try:
-                message: str = client_socket.recv(1024).decode("utf-8")
-                if message == "!exit":
-                    self.remove_client(client_socket)
-                    break
-                if message == "!who":
-                    self.show_online_users(client_socket)
-                    continue
-                sender_info: str = f"{self.clients[client_socket][0]}"
-                message_with_sender = (
-                    f"{sender_info} [{datetime.now().strftime(TIMESTAMP_FORMAT)}]: {message}"
-                )
-                if not message:
-                    break
-                print(f"{addr} says: {message}")
-                self.broadcast(message_with_sender)
-                self.store_message_on_database(message, client_socket)
-
+                n: int = recv_from(client_socket)
+            except BlockingIOError:
+                return
             except OSError as e:
-                if e.errno == 9:
-                    print("Client closed the connection")
-                else:
-                    print(f"Error receiving message from {addr}: {e}")
+                logger.warning("Error receiving message from %s: %s", connection.addr, e)
+                self.close_client(client_socket)
+                return
+
+            if not n:
+                self.close_client(client_socket)
+                return
+            for frame in frames():
+                if not handle_message(connection, frame):
+                    return
+
+    def handle_message(self, connection: ClientConnection, frame: memoryview) -> bool:
+        """
+        Handle one message received from a client.
+
+        The first message of a connection is its token; later ones are commands or chat
+        messages to broadcast.
+
+        Args:
+            connection (ClientConnection): The connection the message arrived on.
+            frame (memoryview): The message payload.
+
+        Returns:
+            bool: False if the connection was closed while handling the message.
+        """
+        message: str = str(frame, "utf-8")
+        if connection.username is None:
+            return self.authenticate_client(connection, message)
+        if message == "!exit":
+            self.close_client(connection.sock)
+            return False
+        if message == "!who":
+            self.show_online_users(connection.sock)
+            return True
+        header: bytes = f"{connection.username} [{current_timestamp()}]: ".encode("utf-8")
+        logger.debug("%s says: %s", connection.addr, message)
+        # Forward the received bytes as-is instead of re-encoding the decoded text.
+        self.broadcast(header + frame)
+        self._pool.submit(self.store_message_on_database, message, connection.user_id)
+        return True
+
+    def close_client(self, client_socket: socket.socket) -> None:
+        """
+        Stop watching a client socket, remove the client and close the socket.
 
-                break
-            except Exception as e:
-                print(f"Error handling client {addr}: {e}")
-                break
+        Closing a socket that is already closed is a no-op, so a client dropped by several
+        code paths is removed and announced only once.
 
+        Args:
+            client_socket (socket.socket): The socket of the client to close.
+        """
+        if client_socket.fileno() == -1:
+            return
+        try:
+            self._selector.unregister(client_socket)
+        except (KeyError, ValueError):
+            pass
         self.remove_client(client_socket)
         client_socket.close()
 
@@ -132,42 +397,176 @@ class ChatServer:
             client_socket (socket.socket):
                 The socket object representing the client connection to be removed.
         """
-        if client_socket in self.clients:
-            username: str = self.clients.pop(client_socket)
+        fd: int = client_socket.fileno()
+        if fd == -1:
+            return
+        with self._clients_lock:
+            idx: Optional[int] = self._idx_by_fd.pop(fd, None)
+            if idx is not None:
+                last: int = len(self._fds) - 1
+                if idx != last:
+                    # Move the last client into the freed slot instead of shifting the lists.
+                    self._fds[idx] = self._fds[last]
+                    self._socks[idx] = self._socks[last]
+                    self._names[idx] = self._names[last]
+                    self._queues[idx] = self._queues[last]
+                    self._idx_by_fd[self._fds[idx]] = idx
+                self._fds.pop()
+                self._socks.pop()
+                self._names.pop()
+                self._queues.pop()
+                self._who_version += 1
+            user_info: Optional[Tuple[str, int]] = self.clients.pop(fd, None)
+        if user_info is not None:
+            username: str = user_info[0]
+            logger.info("%s disconnected", username)
             self.broadcast(f"{username} disconnected")
 
-    def broadcast(self, message: str, client_socket: Optional[socket.socket] = None) -> None:
+    def broadcast(
+        self, message: Union[str, bytes], exclude: Optional[socket.socket] = None
+    ) -> None:
         """
-        Broadcast a message to all connected clients.
+        Queue a message for all connected clients, except `exclude` if given.
+
+        The frame is appended to each recipient's outbound buffer; `flush` sends it.
 
         Args:
-            message (str): The message to be broadcasted.
+            message (Union[str, bytes]): The message to be broadcasted. Text is UTF-8 encoded;
+                                         either way the message is framed once for all
+                                         recipients.
+            exclude (Optional[socket.socket]): A local client that should not receive it.
         """
-        clients_dict = dict(self.clients)
-        for client, user_info in clients_dict.items():
-            if client_socket and client != client_socket:
-                continue
+        payload: bytes = encode_frame(
+            message.encode("utf-8") if isinstance(message, str) else message
+        )
+        self._queue_for_all(payload, exclude)
+        if self._fanout is not None:
+            self._fanout.publish(payload)
+
+    def _queue_for(self, client_socket: socket.socket, payload: bytes) -> None:
+        """
+        Append a framed message to the outbound buffer of one connected client.
 
-            username, _ = user_info
-            try:
-                client.send(message.encode("utf-8"))
-            except Exception as e:
-                print(f"Error broadcasting message to {username} : {e}")
-                self.remove_client(client)
-                client.close()
+        Args:
+            client_socket (socket.socket): The recipient.
+            payload (bytes): The length-prefixed message.
+        """
+        idx: Optional[int] = self._idx_by_fd.get(client_socket.fileno())
+        if idx is not None:
+            self._queues[idx].append(payload)
+            self._pending.add(self._fds[idx])
+
+    def _queue_for_all(self, payload: bytes, exclude: Optional[socket.socket] = None) -> None:
+        """
+        Append a framed message to the outbound buffer of every connected client.
+
+        The excluded client is skipped by walking the lists on either side of its index,
+        so the loop itself does no per-recipient comparison.
+
+        Args:
+            payload (bytes): The length-prefixed message.
+            exclude (Optional[socket.socket]): A client that should not receive it.
+        """
+        idx: Optional[int] = None
+        if exclude is not None:
+            idx = self._idx_by_fd.get(exclude.fileno())
+        if idx is None:
+            for queue in self._queues:
+                queue.append(payload)
+            self._pending.update(self._fds)
+            return
+
+        for queue in self._queues[:idx]:
+            queue.append(payload)
+        for queue in self._queues[idx + 1 :]:
+            queue.append(payload)
+        self._pending.update(self._fds)
+        self._pending.discard(self._fds[idx])
+
+    def _relay_from_peers(self) -> None:
+        """
+        Queue the messages other server processes broadcast for the local clients.
+        """
+        for payload in self._fanout.receive():
+            self._queue_for_all(payload)
+
+    def flush(self) -> None:
+        """
+        Send the outbound queue of every client that has pending data.
+
+        Each queue goes out with a single non-blocking `sendmsg`; whatever the kernel does
+        not accept stays queued and the socket is watched for writability until it
+        drains, so a slow client never delays the others. Clients whose send fails, or
+        whose backlog exceeds OUTBOUND_HIGH_WATER, are closed, which can queue more
+        messages, so this repeats until nothing is pending.
+        """
+        while self._pending:
+            pending: Set[int] = self._pending
+            self._pending = set()
+            failed: List[socket.socket] = []
+            for fd in pending:
+                idx: Optional[int] = self._idx_by_fd.get(fd)
+                if idx is None:
+                    continue
+                client: socket.socket = self._socks[idx]
+                queue: Deque[Chunk] = self._queues[idx]
+                try:
+                    send_queued(client, queue)
+                except OSError as e:
+                    logger.warning("Error broadcasting message to %s: %s", self._names[idx], e)
+                    failed.append(client)
+                    continue
+                if queue and sum(map(len, queue)) > OUTBOUND_HIGH_WATER:
+                    logger.warning("Dropping %s: not reading its messages", self._names[idx])
+                    failed.append(client)
+                    continue
+                self._watch_writable(client, bool(queue))
+
+            # Closed after the loop: removing a client reorders the lists being walked.
+            for client in failed:
+                self.close_client(client)
+
+    def _watch_writable(self, client_socket: socket.socket, writable: bool) -> None:
+        """
+        Watch a client socket for writability only while its outbound queue is not empty.
+
+        Args:
+            client_socket (socket.socket): The client socket.
+            writable (bool): Whether the socket still has data waiting to be sent.
+        """
+        try:
+            key: selectors.SelectorKey = self._selector.get_key(client_socket)
+        except (KeyError, ValueError):
+            return
+        events: int = selectors.EVENT_READ
+        if writable:
+            events |= selectors.EVENT_WRITE
+        if key.events != events:
+            self._selector.modify(client_socket, events, key.data)
 
     def show_online_users(self, client_socket: socket.socket) -> None:
         """
         Send the list of online users to the requesting client.
 
+        The framed list is cached and only rebuilt after a client joins or leaves.
+
         Args:
             client_socket (socket.socket): The socket object representing the client 
                                            that requested the list.
         """
-        users: List[str] = [username for username, user_id in self.clients.values()]
-        users_online: str = str(len(users)) + " USERS ONLINE:\n" + "\n".join(users)
-        print(users_online)
-        self.broadcast(users_online, client_socket)
+        if self._who_cache[0] != self._who_version:
+            users: List[str] = list(self._names)
+            users_online: str = str(len(users)) + " USERS ONLINE:\n" + "\n".join(users)
+            logger.debug(users_online)
+            self._who_cache = (self._who_version, encode_frame(users_online.encode("utf-8")))
+        self._queue_for(client_socket, self._who_cache[1])
+
+    def _place_worker(self) -> None:
+        """
+        Move a new worker thread off the event loop's CPU, if the loop is pinned.
+        """
+        if self._worker_cpus:
+            os.sched_setaffinity(0, self._worker_cpus)
 
     def print_active_threads(self) -> None:
         """
@@ -178,12 +577,19 @@ class ChatServer:
         for thread in threads:
             print(f"  - {thread.name}")
 
-    def store_message_on_database(self, message: str, client_socket: socket.socket) -> None:
-        public_message = PublicMessage(author_id=self.clients[client_socket][1], message=message)
-        print(public_message)
-        self.session.add(public_message)
-        self.session.commit()
-        
+    def store_message_on_database(self, message: str, author_id: Optional[int]) -> None:
+        """
+        Store a public message. Runs on the worker pool, with that thread's session.
+
+        Args:
+            message (str): The message content.
+            author_id (Optional[int]): The user id of the sender.
+        """
+        public_message = PublicMessage(author_id=author_id, message=message)
+        logger.debug("Storing %s", public_message)
+        session = Session()
+        session.add(public_message)
+        session.commit()
 
     def verify_token(self, token: str) -> Tuple[str|None, str|None]:
         """
@@ -192,6 +598,8 @@ class ChatServer:
         This method decodes the provided JWT token using the secret key.
         If the token is valid, it returns the username from the decoded token.
         If the token is expired or invalid, it prints an appropriate message and returns None.
+        Valid tokens are kept in a bounded LRU cache, so a client reconnecting with the
+        same token skips the HMAC check and JSON decode until the token expires.
 
         Args:
             token (str): The JWT token to be verified.
@@ -203,11 +611,25 @@ class ChatServer:
             jwt.ExpiredSignatureError: If the token has expired.
             jwt.InvalidTokenError: If the token is invalid.
         """
+        cached: Optional[Tuple[str, int, float]] = self._token_cache.get(token)
+        if cached is not None:
+            if cached[2] > time.time():
+                self._token_cache.move_to_end(token)
+                return cached[0], cached[1]
+            del self._token_cache[token]
+
         try:
-            decoded_token = jwt.decode(token, self.secret_key, algorithms=["HS256"])
-            return decoded_token.get("username"), decoded_token.get("user_id")
+            decoded_token = self._jwt_decoder.decode(
+                token, self.secret_key, algorithms=self._algorithms
+            )
+            username, user_id = decoded_token.get("username"), decoded_token.get("user_id")
+            if username:
+                self._token_cache[token] = (username, user_id, decoded_token.get("exp", math.inf))
+                if len(self._token_cache) > TOKEN_CACHE_SIZE:
+                    self._token_cache.popitem(last=False)
+            return username, user_id
         except jwt.ExpiredSignatureError:
-            print("Token has expired")
+            logger.info("Token has expired")
         except jwt.InvalidTokenError:
-            print("Invalid token")
+            logger.info("Invalid token")
         return None, None
@@ -0,0 +1,31 @@
+"""
+Gunicorn Configuration for the Authentication API
+
+This module configures gunicorn to serve the Flask application with gevent
+workers, so a worker waiting on PostgreSQL or password hashing no longer blocks
+every other request assigned to it.
+
+Usage:
+    gunicorn run_flask:app
+
+Notes:
+    - For CPU-heavy login bursts, `-k gthread --threads 8` is an alternative:
+      argon2-cffi releases the GIL while hashing, so threads hash in parallel.
+"""
+
+bind: str = "127.0.0.1:5000"
+worker_class: str = "gevent"
+workers: int = 4
+worker_connections: int = 1000
+
+
+def post_fork(server, worker) -> None:  # pylint: disable=unused-argument
+    """
+    Make psycopg2 cooperative in each gevent worker.
+
+    Without this, every database wait blocks the whole worker instead of
+    yielding to other greenlets.
+    """
+    from psycogreen.gevent import patch_psycopg  # pylint: disable=import-outside-toplevel
+
+    patch_psycopg()
@@ -1,9 +1,54 @@
 """
 Module to run the chat server.
+
+Set CHAT_SERVER_PROCESSES to run several server processes on the same port; the kernel
+spreads connections across them (SO_REUSEPORT) and broadcasts are relayed between them.
+Each process pins its event loop to its own CPU.
+
+CHAT_SERVER_LOG_LEVEL sets the log level (default WARNING); INFO adds connections and
+disconnections, DEBUG adds every chat message.
 """
 
+import logging
+import multiprocessing
+import os
+
+from classes.server.fanout import PeerFanout
 from classes.server.server import ChatServer
 
-if __name__ == "__main__":
-    chatServer: ChatServer = ChatServer()
+PORT: int = 9999
+
+
+def run_process(index: int, processes: int) -> None:
+    """
+    Run one of several chat server processes sharing the port.
+
+    Args:
+        index (int): The index of this process.
+        processes (int): The number of server processes.
+    """
+    fanout: PeerFanout = PeerFanout(index, processes, PORT)
+    chatServer: ChatServer = ChatServer(
+        port=PORT, reuse_port=True, fanout=fanout, cpu=index % (os.cpu_count() or 1)
+    )
     chatServer.start()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.environ.get("CHAT_SERVER_LOG_LEVEL", "WARNING"),
+        format="%(asctime)s %(processName)s %(levelname)s %(message)s",
+    )
+    processes: int = int(os.environ.get("CHAT_SERVER_PROCESSES", "1"))
+    if processes <= 1:
+        chatServer: ChatServer = ChatServer(port=PORT)
+        chatServer.start()
+    else:
+        workers = [
+            multiprocessing.Process(target=run_process, args=(index, processes))
+            for index in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
@@ -1,6 +1,5 @@
 import socket
 import threading
-import time
 from typing import Tuple
 import pytest
 from classes.client.client import ChatClient
@@ -30,7 +29,7 @@ def run_server_in_thread(chat_server: ChatServer) -> None:
     """
     server_thread = threading.Thread(target=chat_server.start, daemon=True)
     server_thread.start()
-    time.sleep(1)
+    assert chat_server.ready.wait(timeout=2)
 
 
 def test_chat_client_initialization(chat_server: Tuple[ChatServer, int]) -> None:
@@ -0,0 +1,76 @@
+"""
+Unit tests for the length-prefixed message framing.
+
+This module contains tests for the following functionalities:
+- Decoding several frames delivered by a single read.
+- Reassembling a frame split across reads.
+- Growing the receive buffer for a frame longer than its initial size.
+- Rejecting frames larger than the receive buffer.
+"""
+
+import socket
+import pytest
+from utils.framing import INITIAL_BUFFER_SIZE, FrameReader, encode_frame
+
+
+def test_frame_reader_splits_merged_messages() -> None:
+    """
+    Test that two messages arriving in one read are returned as two frames.
+    """
+    reader_socket, writer_socket = socket.socketpair()
+    with reader_socket, writer_socket:
+        writer_socket.sendall(encode_frame(b"Hello!") + encode_frame(b"!who"))
+        reader: FrameReader = FrameReader()
+        reader.recv_from(reader_socket)
+
+        assert [bytes(frame) for frame in reader.frames()] == [b"Hello!", b"!who"]
+
+
+def test_frame_reader_joins_split_message() -> None:
+    """
+    Test that a message split across two reads is returned once it is complete.
+    """
+    reader_socket, writer_socket = socket.socketpair()
+    with reader_socket, writer_socket:
+        frame: bytes = encode_frame(b"Hello!")
+        reader: FrameReader = FrameReader()
+
+        writer_socket.sendall(frame[:5])
+        reader.recv_from(reader_socket)
+        assert not list(reader.frames())
+
+        writer_socket.sendall(frame[5:])
+        reader.recv_from(reader_socket)
+        assert [bytes(frame) for frame in reader.frames()] == [b"Hello!"]
+
+
+def test_frame_reader_grows_for_long_message() -> None:
+    """
+    Test that a message longer than the initial buffer is received whole.
+    """
+    reader_socket, writer_socket = socket.socketpair()
+    with reader_socket, writer_socket:
+        message: bytes = b"x" * (3 * INITIAL_BUFFER_SIZE)
+        writer_socket.sendall(encode_frame(message))
+        reader: FrameReader = FrameReader()
+
+        frames = []
+        while not frames:
+            reader.recv_from(reader_socket)
+            frames = [bytes(frame) for frame in reader.frames()]
+
+        assert frames == [message]
+
+
+def test_frame_reader_rejects_oversized_frame() -> None:
+    """
+    Test that a frame announcing more bytes than the buffer holds is rejected.
+    """
+    reader_socket, writer_socket = socket.socketpair()
+    with reader_socket, writer_socket:
+        writer_socket.sendall(encode_frame(b"x" * 32))
+        reader: FrameReader = FrameReader(capacity=16)
+        reader.recv_from(reader_socket)
+
+        with pytest.raises(ValueError):
+            list(reader.frames())
@@ -13,16 +13,18 @@ The tests utilize the pytest framework and fixtures to set up and tear down the
 import socket
 import threading
 import time
+from collections import deque
 from datetime import datetime, timezone, timedelta
-from typing import Tuple
+from typing import Callable, List, Tuple
 import jwt
-import bcrypt
 import pytest
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine, text
-from classes.server.server import ChatServer
+from classes.server.fanout import PeerFanout
+from classes.server.server import OUTBOUND_HIGH_WATER, ChatServer, send_queued
+from utils.framing import FRAME_HEADER, FRAME_HEADER_SIZE, encode_frame
 from app import app
-from app.models import User, PublicMessage, Base
+from app.models import User, PublicMessage, Base, ph
 
 
 @pytest.fixture(scope="session")
@@ -63,8 +65,7 @@ def auth_token(db_session):
     - Yields the authentication token to tests that require it.
     """
     password: str = "testpassword"
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-    hashed_password_str: str = hashed_password.decode("utf-8")
+    hashed_password_str: str = ph.hash(password)
     user = User(username="Tester", password_hash=hashed_password_str)
     db_session.add(user)
 
@@ -87,8 +88,7 @@ def auth_token2(db_session):
     - Yields the authentication token to tests that require it.
     """
     password: str = "testpassword"
-    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-    hashed_password_str: str = hashed_password.decode("utf-8")
+    hashed_password_str: str = ph.hash(password)
     user = User(username="Tester2", password_hash=hashed_password_str)
     db_session.add(user)
 
@@ -100,17 +100,48 @@ def auth_token2(db_session):
     return token
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def chat_server() -> Tuple[ChatServer, int]:
     """
-    Fixture to create and return a ChatServer instance bound to an available port.
+    Fixture to create a ChatServer bound to an available port and run it for the whole module.
 
-    Returns:
-        Tuple[ChatServer, int]: The ChatServer instance and the port it is bound to.
+    Yields:
+        Tuple[ChatServer, int]: The running ChatServer instance and the port it is bound to.
     """
     server: ChatServer = ChatServer(port=0)
     server.port = server.server_socket.getsockname()[1]
-    return server, server.port
+    yield server, server.port
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_server(chat_server: Tuple[ChatServer, int]):
+    """
+    Fixture to check that every client of the shared server is gone after each test.
+
+    The client socket fixtures close their sockets on teardown; this waits until the
+    server has removed those clients so the next test starts from an empty chat.
+
+    Args:
+        chat_server (Tuple[ChatServer, int]): The running ChatServer instance and its port.
+    """
+    yield
+    server, _ = chat_server
+    assert wait_until(lambda: not server.clients)
+
+
+@pytest.fixture
+def idle_server():
+    """
+    Fixture to create a ChatServer that is not running, for tests that drive it directly.
+
+    Yields:
+        ChatServer: The ChatServer instance.
+    """
+    server: ChatServer = ChatServer(port=0)
+    yield server
+    server.shutdown()
+    server.server_socket.close()
 
 
 @pytest.fixture
@@ -139,6 +170,51 @@ def other_socket():
     s.close()
 
 
+def send_message(sock: socket.socket, payload: bytes) -> None:
+    """
+    Send one length-prefixed message to the server.
+
+    Args:
+        sock (socket.socket): The client socket.
+        payload (bytes): The message to send.
+    """
+    sock.sendall(encode_frame(payload))
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    """
+    Receive exactly `size` bytes from a socket.
+
+    Args:
+        sock (socket.socket): The client socket.
+        size (int): The number of bytes to read.
+
+    Returns:
+        bytes: The received bytes.
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk: bytes = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Server closed the connection")
+        data += chunk
+    return bytes(data)
+
+
+def recv_message(sock: socket.socket) -> bytes:
+    """
+    Receive one length-prefixed message from the server.
+
+    Args:
+        sock (socket.socket): The client socket.
+
+    Returns:
+        bytes: The message payload.
+    """
+    (length,) = FRAME_HEADER.unpack(recv_exact(sock, FRAME_HEADER_SIZE))
+    return recv_exact(sock, length)
+
+
 def run_server_in_thread(chat_server: ChatServer) -> None:
     """
     Run the ChatServer in a separate thread.
@@ -148,7 +224,29 @@ def run_server_in_thread(chat_server: ChatServer) -> None:
     """
     server_thread = threading.Thread(target=chat_server.start, daemon=True)
     server_thread.start()
-    time.sleep(1)
+    assert chat_server.ready.wait(timeout=2)
+
+
+def wait_until(
+    condition: Callable[[], bool], timeout: float = 2.0, interval: float = 0.001
+) -> bool:
+    """
+    Poll a condition until it holds or the timeout expires.
+
+    Args:
+        condition (Callable[[], bool]): The condition to wait for.
+        timeout (float): Maximum time to wait, in seconds.
+        interval (float): Time between two checks, in seconds.
+
+    Returns:
+        bool: Whether the condition held before the timeout.
+    """
+    deadline: float = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(interval)
+    return True
 
 
 def test_chat_server_initialization(chat_server: Tuple[ChatServer, int]) -> None:
@@ -175,11 +273,10 @@ def test_chat_server_start(
         client_socket (socket.socket): The client socket.
     """
     server, port = chat_server
-    run_server_in_thread(server)
     client_socket.connect((server.host, port))
 
-    client_socket.send(auth_token.encode("utf-8"))
-    response: str = client_socket.recv(1024).decode("utf-8")
+    send_message(client_socket, auth_token.encode("utf-8"))
+    response: str = recv_message(client_socket).decode("utf-8")
 
     assert response == "Tester entered the chat!"
 
@@ -195,12 +292,11 @@ def test_chat_server_user_connected(
         client_socket (socket.socket): The client socket.
     """
     server, port = chat_server
-    run_server_in_thread(server)
     client_socket.connect((server.host, port))
 
-    client_socket.send(auth_token.encode("utf-8"))
-    _ = client_socket.recv(1024).decode("utf-8")
-    time.sleep(1)
+    send_message(client_socket, auth_token.encode("utf-8"))
+    _ = recv_message(client_socket).decode("utf-8")
+    assert wait_until(lambda: len(server.clients) == 1)
 
     assert len(server.clients.keys()) == 1
     assert "Tester" in [user_data[0] for user_data in server.clients.values()]
@@ -217,13 +313,12 @@ def test_chat_server_user_disconnected(
         client_socket (socket.socket): The client socket.
     """
     server, port = chat_server
-    run_server_in_thread(server)
     client_socket.connect((server.host, port))
-    client_socket.send(auth_token.encode("utf-8"))
-    _ = client_socket.recv(1024).decode("utf-8")
+    send_message(client_socket, auth_token.encode("utf-8"))
+    _ = recv_message(client_socket).decode("utf-8")
 
-    client_socket.send("!exit".encode("utf-8"))
-    time.sleep(1)
+    send_message(client_socket, "!exit".encode("utf-8"))
+    assert wait_until(lambda: not server.clients)
 
     assert len(server.clients.keys()) == 0
     assert "Tester" not in [user_data[0] for user_data in server.clients.values()]
@@ -241,13 +336,12 @@ def test_chat_server_user_disconnected_forced(
         client_socket (socket.socket): The client socket.
     """
     server, port = chat_server
-    run_server_in_thread(server)
     client_socket.connect((server.host, port))
-    client_socket.send(auth_token.encode("utf-8"))
-    _ = client_socket.recv(1024).decode("utf-8")
+    send_message(client_socket, auth_token.encode("utf-8"))
+    _ = recv_message(client_socket).decode("utf-8")
 
     client_socket.close()
-    time.sleep(1)
+    assert wait_until(lambda: not server.clients)
 
     assert len(server.clients.keys()) == 0
     assert "Tester" not in server.clients.values()
@@ -269,18 +363,16 @@ def test_chat_server_users_online(
         other_socket (socket.socket): Another client socket.
     """
     server, port = chat_server
-    run_server_in_thread(server)
     client_socket.connect((server.host, port))
     other_socket.connect((server.host, port))
-    client_socket.send(auth_token.encode("utf-8"))
-    _ = client_socket.recv(1024).decode("utf-8")
-    other_socket.send(auth_token2.encode("utf-8"))
-    _ = client_socket.recv(1024).decode("utf-8")
-    _ = other_socket.recv(1024).decode("utf-8")
+    send_message(client_socket, auth_token.encode("utf-8"))
+    _ = recv_message(client_socket).decode("utf-8")
+    send_message(other_socket, auth_token2.encode("utf-8"))
+    _ = recv_message(client_socket).decode("utf-8")
+    _ = recv_message(other_socket).decode("utf-8")
 
-    client_socket.send("!who".encode("utf-8"))
-    time.sleep(1)
-    response: str = client_socket.recv(1024).decode("utf-8")
+    send_message(client_socket, "!who".encode("utf-8"))
+    response: str = recv_message(client_socket).decode("utf-8")
 
     assert "2 USERS ONLINE:\nTester\nTester2" == response
 
@@ -301,21 +393,230 @@ def test_chat_server_message_broadcast(
         other_socket (socket.socket): Another client socket.
     """
     server, port = chat_server
-    run_server_in_thread(server)
     client_socket.connect((server.host, port))
     other_socket.connect((server.host, port))
-    client_socket.send(auth_token.encode("utf-8"))
-    _ = client_socket.recv(1024).decode("utf-8")
-    other_socket.send(auth_token2.encode("utf-8"))
-    _ = client_socket.recv(1024).decode("utf-8")
-    _ = other_socket.recv(1024).decode("utf-8")
-
-    client_socket.send("Hello!".encode("utf-8"))
-    time.sleep(1)
-    response: str = other_socket.recv(1024).decode("utf-8")
+    send_message(client_socket, auth_token.encode("utf-8"))
+    _ = recv_message(client_socket).decode("utf-8")
+    send_message(other_socket, auth_token2.encode("utf-8"))
+    _ = recv_message(client_socket).decode("utf-8")
+    _ = recv_message(other_socket).decode("utf-8")
+
+    send_message(client_socket, "Hello!".encode("utf-8"))
+    response: str = recv_message(other_socket).decode("utf-8")
     response_parts = response.split(": ")
     username, _ = response_parts[0].split(" [")
     message = response_parts[1]
 
     assert "Hello!" == message
     assert "Tester" == username
+
+
+def test_chat_server_broadcast_encodes_once(idle_server: ChatServer, mocker) -> None:
+    """
+    Test that a text broadcast is encoded once and the same payload is queued for every client.
+
+    Args:
+        idle_server (ChatServer): A ChatServer instance that is not running.
+        mocker: The pytest-mock fixture used to create stand-in client sockets.
+    """
+    server = idle_server
+    server._queues = [deque() for _ in range(3)]
+
+    server.broadcast("Hello!")
+
+    payload = server._queues[0][0]
+    assert payload == encode_frame(b"Hello!")
+    assert all(list(queue) == [payload] and queue[0] is payload for queue in server._queues)
+
+
+def test_chat_server_flush_coalesces_messages(idle_server: ChatServer, mocker) -> None:
+    """
+    Test that messages queued for a client between flushes go out in a single send.
+
+    Args:
+        idle_server (ChatServer): A ChatServer instance that is not running.
+        mocker: The pytest-mock fixture used to create stand-in client sockets.
+    """
+    server = idle_server
+    sock = mocker.Mock(spec=socket.socket)
+    sent: List[bytes] = []
+    sock.sendmsg.side_effect = lambda buffers: sent.append(b"".join(buffers)) or len(sent[-1])
+    server._fds, server._socks, server._names = [100], [sock], ["Tester"]
+    server._queues, server._idx_by_fd = [deque()], {100: 0}
+
+    server.broadcast("Hello!")
+    server.broadcast("Bye!")
+    server.flush()
+
+    assert sent == [encode_frame(b"Hello!") + encode_frame(b"Bye!")]
+    assert not server._queues[0]
+
+
+def test_chat_server_remove_client_keeps_index(idle_server: ChatServer, mocker) -> None:
+    """
+    Test that removing a client moves the last client into its slot and updates the index.
+
+    Args:
+        idle_server (ChatServer): A ChatServer instance that is not running.
+        mocker: The pytest-mock fixture used to create stand-in client sockets.
+    """
+    server = idle_server
+    sockets = [mocker.Mock(spec=socket.socket) for _ in range(3)]
+    for fd, sock in enumerate(sockets, start=100):
+        sock.fileno.return_value = fd
+        server.clients[fd] = (f"Tester{fd}", fd)
+        server._idx_by_fd[fd] = len(server._fds)
+        server._fds.append(fd)
+        server._socks.append(sock)
+        server._names.append(f"Tester{fd}")
+        server._queues.append(deque())
+
+    server.remove_client(sockets[0])
+
+    assert server._fds == [102, 101]
+    assert server._socks == [sockets[2], sockets[1]]
+    assert server._names == ["Tester102", "Tester101"]
+    assert server._idx_by_fd == {102: 0, 101: 1}
+    assert 100 not in server.clients
+    assert list(server._queues[0]) == [encode_frame(b"Tester100 disconnected")]
+
+
+def test_peer_fanout_relays_broadcast() -> None:
+    """
+    Test that a broadcast on one server process is queued for the clients of another.
+    """
+    fanouts = [PeerFanout(index, 2, 0) for index in range(2)]
+    servers = [ChatServer(port=0, reuse_port=True, fanout=fanout) for fanout in fanouts]
+    try:
+        servers[1]._queues = [deque()]
+
+        servers[0].broadcast("Hello!")
+        servers[1]._relay_from_peers()
+
+        assert list(servers[1]._queues[0]) == [encode_frame(b"Hello!")]
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_socket.close()
+
+
+def test_chat_server_who_reply_is_cached(idle_server: ChatServer, mocker) -> None:
+    """
+    Test that the !who reply is reused until a client leaves, then rebuilt.
+
+    Args:
+        idle_server (ChatServer): A ChatServer instance that is not running.
+        mocker: The pytest-mock fixture used to create stand-in client sockets.
+    """
+    server = idle_server
+    sockets = [mocker.Mock(spec=socket.socket) for _ in range(2)]
+    for fd, sock in enumerate(sockets, start=100):
+        sock.fileno.return_value = fd
+        server.clients[fd] = (f"Tester{fd}", fd)
+        server._idx_by_fd[fd] = len(server._fds)
+        server._fds.append(fd)
+        server._socks.append(sock)
+        server._names.append(f"Tester{fd}")
+        server._queues.append(deque())
+        server._who_version += 1
+
+    server.show_online_users(sockets[0])
+    cached: bytes = server._who_cache[1]
+    server.show_online_users(sockets[1])
+
+    assert server._who_cache[1] is cached
+    assert list(server._queues[1]) == [encode_frame(b"2 USERS ONLINE:\nTester100\nTester101")]
+
+    server.remove_client(sockets[1])
+    server._queues[0].clear()
+    server.show_online_users(sockets[0])
+
+    assert list(server._queues[0]) == [encode_frame(b"1 USERS ONLINE:\nTester100")]
+
+
+def test_chat_server_verify_token_uses_cache(idle_server: ChatServer, mocker) -> None:
+    """
+    Test that a token seen before is not decoded again until it expires.
+
+    Args:
+        idle_server (ChatServer): A ChatServer instance that is not running.
+        mocker: The pytest-mock fixture used to spy on the JWT decoder.
+    """
+    server = idle_server
+    token: str = jwt.encode(
+        {"username": "Tester", "user_id": 1, "exp": int(time.time()) + 600},
+        app.config["SECRET_KEY"],
+        algorithm="HS256",
+    )
+    decode = mocker.spy(server._jwt_decoder, "decode")
+
+    assert server.verify_token(token) == ("Tester", 1)
+    assert server.verify_token(token) == ("Tester", 1)
+    assert decode.call_count == 1
+
+    server._token_cache[token] = ("Tester", 1, time.time() - 1)
+    assert server.verify_token(token) == ("Tester", 1)
+    assert decode.call_count == 2
+
+
+def test_send_queued_keeps_unsent_tail(mocker) -> None:
+    """
+    Test that a partial sendmsg drops the sent chunks and keeps a view of the unsent rest.
+
+    Args:
+        mocker: The pytest-mock fixture used to create a stand-in client socket.
+    """
+    sock = mocker.Mock(spec=socket.socket)
+    sock.sendmsg.return_value = 7
+    queue = deque([b"Hello", b"World!"])
+
+    send_queued(sock, queue)
+
+    sock.sendmsg.assert_called_once_with([b"Hello", b"World!"])
+    assert [bytes(chunk) for chunk in queue] == [b"rld!"]
+
+
+def test_chat_server_broadcast_excludes_client(idle_server: ChatServer, mocker) -> None:
+    """
+    Test that a broadcast with `exclude` reaches every client except the excluded one.
+
+    Args:
+        idle_server (ChatServer): A ChatServer instance that is not running.
+        mocker: The pytest-mock fixture used to create stand-in client sockets.
+    """
+    server = idle_server
+    sockets = [mocker.Mock(spec=socket.socket) for _ in range(3)]
+    for fd, sock in enumerate(sockets, start=100):
+        sock.fileno.return_value = fd
+        server._idx_by_fd[fd] = len(server._fds)
+        server._fds.append(fd)
+        server._socks.append(sock)
+        server._queues.append(deque())
+
+    server.broadcast("Hello!", exclude=sockets[1])
+
+    assert [len(queue) for queue in server._queues] == [1, 0, 1]
+    assert server._pending == {100, 102}
+
+
+def test_chat_server_flush_drops_stuck_client(idle_server: ChatServer, mocker) -> None:
+    """
+    Test that a client whose backlog passes the high-water mark is disconnected.
+
+    Args:
+        idle_server (ChatServer): A ChatServer instance that is not running.
+        mocker: The pytest-mock fixture used to create a stand-in client socket.
+    """
+    server = idle_server
+    sock = mocker.Mock(spec=socket.socket)
+    sock.fileno.return_value = 100
+    sock.sendmsg.side_effect = BlockingIOError
+    server.clients[100] = ("Tester", 1)
+    server._fds, server._socks, server._names = [100], [sock], ["Tester"]
+    server._queues, server._idx_by_fd = [deque()], {100: 0}
+
+    server.broadcast(b"x" * (OUTBOUND_HIGH_WATER + 1))
+    server.flush()
+
+    assert 100 not in server.clients
+    sock.close.assert_called_once()
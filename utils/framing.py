@@ -0,0 +1,134 @@
+"""
+Message Framing Utilities
+
+This script defines the length-prefixed framing shared by the chat client and server.
+Every message on the chat socket is a 4-byte big-endian length followed by that many
+bytes of UTF-8 payload, so message boundaries survive TCP splitting or merging reads.
+
+Classes:
+    - FrameReader: Reads from a socket into a reusable buffer and yields complete frames.
+
+Functions:
+    - encode_frame: Prefix a payload with its length.
+"""
+
+import socket
+import struct
+from typing import Iterator
+
+FRAME_HEADER: struct.Struct = struct.Struct(">I")
+FRAME_HEADER_SIZE: int = FRAME_HEADER.size
+RECV_BUFFER_SIZE: int = 65536
+INITIAL_BUFFER_SIZE: int = 4096
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """
+    Prefix a payload with its 4-byte big-endian length.
+
+    Args:
+        payload (bytes): The message bytes to frame.
+
+    Returns:
+        bytes: The framed message, ready to be sent.
+    """
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class FrameReader:
+    """
+    Incremental reader for length-prefixed frames.
+
+    Bytes are received with `recv_into` straight into one preallocated buffer, so a
+    single read can deliver several frames (or part of one) without allocating. The
+    buffer starts small, which is enough for chat messages, and only grows (up to
+    `capacity`) when a longer frame arrives.
+
+    Attributes:
+        capacity (int): Largest size the receive buffer may grow to, which bounds the
+                        size of a frame.
+
+    Methods:
+        recv_from(sock: socket.socket): Read whatever the socket has into the buffer.
+        frames(): Yield every complete frame currently buffered.
+    """
+
+    def __init__(self, capacity: int = RECV_BUFFER_SIZE) -> None:
+        """
+        Initialize the FrameReader instance.
+
+        Args:
+            capacity (int): Largest size of the receive buffer in bytes.
+        """
+        self.capacity: int = capacity
+        self._buf: bytearray = bytearray(min(INITIAL_BUFFER_SIZE, capacity))
+        self._view: memoryview = memoryview(self._buf)
+        self._end: int = 0
+
+    def recv_from(self, sock: socket.socket) -> int:
+        """
+        Read available bytes from a socket into the free part of the buffer.
+
+        Args:
+            sock (socket.socket): The socket to read from.
+
+        Returns:
+            int: The number of bytes read; 0 means the peer closed the connection.
+        """
+        n: int = sock.recv_into(self._view[self._end :])
+        self._end += n
+        return n
+
+    def frames(self) -> Iterator[memoryview]:
+        """
+        Yield the payload of every complete frame in the buffer.
+
+        The yielded views point into the receive buffer and are only valid until the
+        next frame is requested; copy or decode them right away. Partial frames are
+        kept for the next read once the generator is exhausted.
+
+        Yields:
+            memoryview: The payload of one frame.
+
+        Raises:
+            ValueError: If a frame announces a length that cannot fit in the buffer.
+        """
+        buf: bytearray = self._buf
+        view: memoryview = self._view
+        unpack_from = FRAME_HEADER.unpack_from
+        max_length: int = self.capacity - FRAME_HEADER_SIZE
+        start: int = 0
+        end: int = self._end
+        while end - start >= FRAME_HEADER_SIZE:
+            (length,) = unpack_from(buf, start)
+            if length > max_length:
+                raise ValueError(f"Frame of {length} bytes exceeds the receive buffer")
+            payload_start: int = start + FRAME_HEADER_SIZE
+            frame_end: int = payload_start + length
+            if frame_end > end:
+                break
+            yield view[payload_start:frame_end]
+            start = frame_end
+
+        remaining: int = end - start
+        if start:
+            buf[:remaining] = buf[start:end]
+        self._end = remaining
+
+        if remaining >= FRAME_HEADER_SIZE:
+            # The incomplete frame is larger than the buffer: grow it so the rest fits.
+            needed: int = FRAME_HEADER_SIZE + unpack_from(buf, 0)[0]
+            if needed > len(buf):
+                self._grow(needed)
+
+    def _grow(self, needed: int) -> None:
+        """
+        Replace the receive buffer with a larger one, keeping the buffered bytes.
+
+        Args:
+            needed (int): The minimum size of the new buffer; at most `capacity`.
+        """
+        grown: bytearray = bytearray(min(max(needed, 2 * len(self._buf)), self.capacity))
+        grown[: self._end] = self._buf[: self._end]
+        self._buf = grown
+        self._view = memoryview(grown)